@@ -7,6 +7,7 @@ from os.path import abspath, dirname
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from ocean_provider.utils.basics import get_config
 
@@ -15,9 +16,22 @@ SQLALCHEMY_DATABASE_URL = "sqlite:////" + os.path.join(
     PROJECT_ROOT, "db", get_config().storage_path
 )
 
+# file based sqlite defaults to NullPool, which opens a new connection
+# for every checkout; keep connections around between requests instead
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+
+def init_db():
+    """Creates the tables of `ocean_provider.models` that do not exist yet."""
+    from ocean_provider import models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
@@ -15,18 +15,9 @@ from flask_cors import CORS
 from flask_sieve import Sieve
 from sqlalchemy.orm import scoped_session
 
-from .database import Base, SessionLocal, engine
-
-with engine.connect() as con:
-    rs = con.execute(
-        """
-        CREATE TABLE IF NOT EXISTS user_nonce (
-          address VARCHAR(255) NOT NULL,
-          nonce VARCHAR(255) NOT NULL,
-          PRIMARY KEY (address)
-        )
-        """
-    )
+from .database import Base, SessionLocal, init_db
+
+init_db()
 
 app = Flask(__name__)
 CORS(app)
@@ -34,6 +25,13 @@ Sieve(app)
 app.session = scoped_session(SessionLocal, scopefunc=_app_ctx_stack.__ident_func__)
 Base.query = app.session.query_property()
 
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    """Returns the session's connection to the pool at the end of a request."""
+    app.session.remove()
+
+
 if "PROVIDER_CONFIG_FILE" in os.environ and os.environ["PROVIDER_CONFIG_FILE"]:
     app.config["PROVIDER_CONFIG_FILE"] = os.environ["PROVIDER_CONFIG_FILE"]
 else:
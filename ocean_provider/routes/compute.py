@@ -411,7 +411,7 @@ def computeResult():
     req = PreparedRequest()
     req.prepare_url(url, params)
     result_url = req.url
-    logger.debug(f"Done processing computeResult, url: {result_url}")
+    logger.debug("Done processing computeResult, url: %s", result_url)
     increment_nonce(data.get("consumerAddress"))
     try:
         return build_download_response(
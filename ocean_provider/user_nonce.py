@@ -4,6 +4,8 @@
 #
 import logging
 
+from sqlalchemy import text
+
 from ocean_provider import models
 from ocean_provider.myapp import app
 
@@ -25,18 +27,23 @@ def increment_nonce(address):
     Increatements the value of `nonce`
     :param: address
     """
-    nonce_object = models.UserNonce.query.filter_by(address=address).first()
-    if nonce_object:
-        nonce_value = nonce_object.nonce
-    else:
-        nonce_object = models.UserNonce(address=address)
-        nonce_value = models.UserNonce.FIRST_NONCE
-
-    logger.debug(
-        f"increment_nonce: {address}, {nonce_value}, "
-        "new nonce {int(nonce_value) + 1}"
+    logger.debug("increment_nonce: %s", address)
+
+    # Done in SQL rather than read-modify-write on the model, so the
+    # increment is atomic and needs no preceding SELECT. `INSERT OR IGNORE`
+    # is used instead of an upsert, which needs sqlite >= 3.24.
+    db.execute(
+        text(
+            "INSERT OR IGNORE INTO user_nonce (address, nonce) "
+            "VALUES (:address, :nonce)"
+        ),
+        {"address": address, "nonce": models.UserNonce.FIRST_NONCE},
+    )
+    db.execute(
+        text(
+            "UPDATE user_nonce SET nonce = CAST(nonce AS INTEGER) + 1 "
+            "WHERE address = :address"
+        ),
+        {"address": address},
     )
-
-    nonce_object.nonce = int(nonce_value) + 1
-    db.add(nonce_object)
     db.commit()
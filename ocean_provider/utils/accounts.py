@@ -2,8 +2,10 @@
 # Copyright 2021 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
-from datetime import datetime
 import logging
+import time
+from functools import lru_cache
+
 import eth_keys
 from eth_account.account import Account
 from eth_account.messages import encode_defunct
@@ -25,9 +27,7 @@ def verify_signature(signer_address, signature, original_msg, nonce: int = None)
     else:
         assert nonce is not None, "nonce is required when not using user auth token."
         message = f"{original_msg}{str(nonce)}"
-        address = Account.recover_message(
-            encode_defunct(text=message), signature=signature
-        )
+        address = recover_message_signer(message, signature)
 
     if address.lower() == signer_address.lower():
         return True
@@ -74,21 +74,34 @@ def check_auth_token(token):
     )
     default_exp = 24 * 60 * 60
     expiration = int(get_config().auth_token_expiration or default_exp)
-    if int(datetime.now().timestamp()) > (int(timestamp) + expiration):
+    if int(time.time()) > (int(timestamp) + expiration):
         return "0x0"
 
     message = f"{auth_token_message}\n{timestamp}"
-    address = Account.recover_message(encode_defunct(text=message), signature=sig)
+    address = recover_message_signer(message, sig)
     return Web3.toChecksumAddress(address)
 
 
+@lru_cache(maxsize=4096)
+def recover_message_signer(message, signature):
+    """
+    Recovering the signer is CPU heavy and its result only depends on the
+    message and signature, so retried requests and reused auth tokens skip it.
+
+    :param message: str
+    :param signature: `hex` value of the signed message
+    :return: address of the signer
+    """
+    return Account.recover_message(encode_defunct(text=message), signature=signature)
+
+
 def generate_auth_token(wallet):
     """
     :param wallet: Wallet instance
     :return: `str`
     """
     raw_msg = get_config().auth_token_message or "Ocean Protocol Authentication"
-    _time = int(datetime.now().timestamp())
+    _time = int(time.time())
     _message = f"{raw_msg}\n{_time}"
     signed = sign_message(_message, wallet)
 
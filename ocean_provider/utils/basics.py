@@ -3,10 +3,13 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import os
+import threading
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import requests
+from cachetools import LRUCache, TTLCache, cached
 from ocean_lib.common.aquarius.aquarius import Aquarius
 from ocean_lib.models.data_token import DataToken
 from ocean_lib.ocean.util import get_web3_connection_provider
@@ -22,13 +25,20 @@ def get_config(config_file: Optional[str] = None) -> Config:
     """
     :return: Config instance
     """
-    return Config(
-        filename=config_file
+    return _get_config(
+        config_file
         if config_file is not None
         else os.getenv("PROVIDER_CONFIG_FILE", "config.ini")
     )
 
 
+@lru_cache(maxsize=8)
+def _get_config(filename: str) -> Config:
+    """Config is fixed for the lifetime of the process, so each file is read
+    (and the environment overrides applied) only once."""
+    return Config(filename=filename)
+
+
 def get_provider_wallet(web3: Optional[Web3] = None) -> Wallet:
     """
     :return: Wallet instance
@@ -54,15 +64,44 @@ def get_provider_wallet(web3: Optional[Web3] = None) -> Wallet:
     return wallet
 
 
+@cached(cache=TTLCache(maxsize=4096, ttl=300), lock=threading.Lock())
 def get_datatoken_minter(datatoken_address):
     """
+    The minter can only change through a propose/approve handover, so the
+    result is cached for a few minutes to avoid an `eth_call` per request.
+
     :return: Eth account address of the Datatoken minter
     """
-    dt = DataToken(get_web3(), datatoken_address)
+    dt = get_datatoken(get_web3(), datatoken_address)
     publisher = dt.minter()
     return publisher
 
 
+_datatokens = LRUCache(maxsize=4096)
+_datatokens_lock = threading.Lock()
+
+
+def get_datatoken(web3, datatoken_address):
+    """
+    Building a `DataToken` parses the DataTokenTemplate ABI into a new web3
+    contract, so instances are kept and reused per network and address. A
+    cached instance keeps the `web3` it was built with, which points at the
+    same node as the given one.
+
+    :return: `DataToken` instance
+    """
+    key = (getattr(web3.provider, "endpoint_uri", None), datatoken_address)
+    with _datatokens_lock:
+        dt = _datatokens.get(key)
+
+    if dt is None:
+        dt = DataToken(web3, datatoken_address)
+        with _datatokens_lock:
+            _datatokens[key] = dt
+
+    return dt
+
+
 def get_artifacts_path():
     """
     :return: Path to the artifact directory
@@ -105,9 +144,38 @@ class LocalFileAdapter(requests.adapters.HTTPAdapter):
         return self.build_response_from_file(request)
 
 
+_aquarius_clients = {}
+_asset_cache = TTLCache(maxsize=1024, ttl=60)
+_asset_cache_lock = threading.Lock()
+
+
+def get_aquarius(metadata_url):
+    """
+    :return: `Aquarius` instance, reused per `metadata_url` so that the
+        underlying requests session and its connection pool are shared
+    """
+    aqua = _aquarius_clients.get(metadata_url)
+    if aqua is None:
+        aqua = _aquarius_clients.setdefault(metadata_url, Aquarius(metadata_url))
+
+    return aqua
+
+
 def get_asset_from_metadatastore(metadata_url, document_id):
     """
+    Lookups are cached for a short while, since DDOs change rarely and the
+    same asset is usually resolved several times while serving one request.
+
     :return: `Ddo` instance
     """
-    aqua = Aquarius(metadata_url)
-    return aqua.get_asset_ddo(document_id)
+    key = (metadata_url, document_id)
+    with _asset_cache_lock:
+        asset = _asset_cache.get(key)
+
+    if asset is None:
+        asset = get_aquarius(metadata_url).get_asset_ddo(document_id)
+        if asset:
+            with _asset_cache_lock:
+                _asset_cache[key] = asset
+
+    return asset
@@ -5,6 +5,8 @@ from ocean_provider.utils.accounts import (
     generate_auth_token,
     get_private_key,
     is_auth_token_valid,
+    recover_message_signer,
+    sign_message,
     verify_signature,
 )
 
@@ -43,3 +45,14 @@ def test_auth_token():
 
 def test_generate_auth_token(consumer_wallet):
     assert generate_auth_token(consumer_wallet)
+
+
+def test_recover_message_signer(consumer_wallet):
+    message = "some message1"
+    signature = sign_message(message, consumer_wallet)
+
+    recover_message_signer.cache_clear()
+    for _ in range(2):
+        address = recover_message_signer(message, signature)
+        assert address.lower() == consumer_wallet.address.lower()
+    assert recover_message_signer.cache_info().hits == 1
@@ -32,6 +32,7 @@ def test_msg_hash():
     hashed = msg_hash(msg)
     expected = "7f83b1657ff1fc53b92dc18148a1d65dfc2d4b1fa3d677284addd200126d9069"
     assert hashed == expected
+    assert msg_hash(msg.encode("utf-8")) == expected
 
 
 def test_service_unavailable(caplog):
@@ -137,6 +138,35 @@ def test_build_download_response():
     )
 
 
+def test_build_download_response_length_headers():
+    request = Mock()
+    request.range = None
+
+    mocked_response = Mock()
+    mocked_response.status_code = 200
+    mocked_response.headers = {"content-length": "7"}
+    requests_session = Mock()
+    requests_session.get = MagicMock(return_value=mocked_response)
+
+    url = "https://source-lllllll.cccc/file.csv"
+    response = build_download_response(request, requests_session, url, url, None)
+    assert response.headers["Content-Length"] == "7"
+
+    # the decoded body length is unknown for encoded content
+    mocked_response.headers = {"content-length": "7", "content-encoding": "gzip"}
+    response = build_download_response(request, requests_session, url, url, None)
+    assert "Content-Length" not in response.headers
+
+    request.range = "bytes=0-3"
+    request.headers = {"range": "bytes=0-3"}
+    mocked_response.status_code = 206
+    mocked_response.headers = {"content-length": "4", "content-range": "bytes 0-3/7"}
+    response = build_download_response(request, requests_session, url, url, None)
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == "bytes 0-3/7"
+    assert response.headers["Content-Length"] == "4"
+
+
 def test_download_ipfs_file(client):
     cid = "QmQfpdcMWnLTXKKW9GPV7NgtEugghgD6HgzSF6gSrp2mL9"
     url = f"ipfs://{cid}"
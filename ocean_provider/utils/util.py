@@ -7,12 +7,13 @@ import json
 import logging
 import mimetypes
 import os
+import threading
 from cgi import parse_header
 
-import requests
+from cachetools import TTLCache
 from flask import Response, request
 from ocean_lib.common.agreements.consumable import ConsumableCodes
-from ocean_lib.models.data_token import DataToken
+from ocean_lib.common.http_requests.requests_session import get_requests_session
 from ocean_lib.ocean.util import to_base_18
 from osmosis_driver_interface.osmosis import Osmosis
 from websockets import ConnectionClosed
@@ -21,16 +22,26 @@ from ocean_provider.utils.accounts import sign_message
 from ocean_provider.utils.basics import (
     get_asset_from_metadatastore,
     get_config,
+    get_datatoken,
     get_provider_wallet,
     get_web3,
 )
 from ocean_provider.utils.encryption import do_decrypt
 from ocean_provider.log import setup_logging
-from ocean_provider.utils.url import is_safe_url
+from ocean_provider.utils.url import REQUEST_TIMEOUT, is_safe_url
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# keeps connections to the operator service alive between lookups
+_requests_session = get_requests_session()
+
+# the operator service address only changes on redeployment
+_compute_address_cache = TTLCache(maxsize=16, ttl=300)
+_compute_address_cache_lock = threading.Lock()
+
 
 def get_metadata_url():
     return get_config().aquarius_url
@@ -40,8 +51,14 @@ def get_request_data(request):
     return request.args if request.args else request.json
 
 
-def msg_hash(message: str):
-    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+def msg_hash(message):
+    """
+    :param message: str or bytes
+    :return: hex digest of the sha256 hash of `message`
+    """
+    if isinstance(message, str):
+        message = message.encode("utf-8")
+    return hashlib.sha256(message).hexdigest()
 
 
 def build_download_response(
@@ -56,7 +73,7 @@ def build_download_response(
 
         if is_range_request:
             download_request_headers = {"Range": request.headers.get("range")}
-            download_response_headers = download_request_headers
+            download_response_headers = dict(download_request_headers)
 
         response = requests_session.get(
             download_url, headers=download_request_headers, stream=True, timeout=3
@@ -90,8 +107,19 @@ def build_download_response(
                 "Connection": "close",
             }
 
+        # iter_content decodes compressed bodies, so the upstream length only
+        # matches what is streamed back when the content is not encoded
+        content_length = response.headers.get("content-length")
+        if content_length and not response.headers.get("content-encoding"):
+            download_response_headers["Content-Length"] = content_length
+
+        if is_range_request:
+            content_range = response.headers.get("content-range")
+            if content_range:
+                download_response_headers["Content-Range"] = content_range
+
         def _generate(_response):
-            for chunk in _response.iter_content(chunk_size=4096):
+            for chunk in _response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                 if chunk:
                     yield chunk
 
@@ -114,7 +142,7 @@ def get_asset_files_list(asset, wallet):
         files_str = do_decrypt(encrypted_files, wallet)
         if not files_str:
             return None
-        logger.debug(f"Got decrypted files str {files_str}")
+        logger.debug("Got decrypted files str %s", files_str)
         files_list = json.loads(files_str)
         if not isinstance(files_list, list):
             raise TypeError(f"Expected a files list, got {type(files_list)}.")
@@ -127,8 +155,10 @@ def get_asset_files_list(asset, wallet):
 
 def get_asset_url_at_index(url_index, asset, wallet):
     logger.debug(
-        f"get_asset_url_at_index(): url_index={url_index}, "
-        f"did={asset.did}, provider={wallet.address}"
+        "get_asset_url_at_index(): url_index=%s, did=%s, provider=%s",
+        url_index,
+        asset.did,
+        wallet.address,
     )
     try:
         files_list = get_asset_urls(asset, wallet)
@@ -148,7 +178,7 @@ def get_asset_url_at_index(url_index, asset, wallet):
 
 def get_asset_urls(asset, wallet):
     """Returns list of urls of the files included in this `asset` in order."""
-    logger.debug(f"get_asset_urls(): did={asset.did}, provider={wallet.address}")
+    logger.debug("get_asset_urls(): did=%s, provider=%s", asset.did, wallet.address)
     try:
         files_list = get_asset_files_list(asset, wallet)
         if not files_list:
@@ -183,7 +213,7 @@ def get_download_url(url, config_file):
         logger.info("Connecting through Osmosis to generate the signed url.")
         osm = Osmosis(url, config_file)
         download_url = osm.data_plugin.generate_url(url)
-        logger.debug(f"Osmosis generated the url: {download_url}")
+        logger.debug("Osmosis generated the url: %s", download_url)
         return download_url
     except Exception as e:
         logger.error(f"Error generating url (using Osmosis): {str(e)}")
@@ -199,36 +229,65 @@ def get_compute_result_endpoint():
 
 
 def get_compute_address():
+    operator_service_url = get_config().operator_service_url
+    with _compute_address_cache_lock:
+        address = _compute_address_cache.get(operator_service_url)
+    if address:
+        return address
+
     try:
-        compute_info = requests.get(get_config().operator_service_url).json()
-        return compute_info.get("address", None)
+        compute_info = _requests_session.get(
+            operator_service_url, timeout=REQUEST_TIMEOUT
+        ).json()
+        address = compute_info.get("address", None)
     except Exception as e:
         logger.error(f"Error getting CtD address: {str(e)}")
         return None
 
+    if address:
+        with _compute_address_cache_lock:
+            _compute_address_cache[operator_service_url] = address
+
+    return address
+
 
 def validate_order(web3, sender, token_address, num_tokens, tx_id, did, service_id):
     logger.debug(
-        f"validate_order: did={did}, service_id={service_id}, tx_id={tx_id}, "
-        f"sender={sender}, num_tokens={num_tokens}, token_address={token_address}"
+        "validate_order: did=%s, service_id=%s, tx_id=%s, "
+        "sender=%s, num_tokens=%s, token_address=%s",
+        did,
+        service_id,
+        tx_id,
+        sender,
+        num_tokens,
+        token_address,
     )
 
-    dt_contract = DataToken(web3, token_address)
+    dt_contract = get_datatoken(web3, token_address)
 
     amount = to_base_18(num_tokens)
     num_tries = 3
     i = 0
     while i < num_tries:
-        logger.debug(f"validate_order is on trial {i + 1} in {num_tries}.")
+        logger.debug("validate_order is on trial %s in %s.", i + 1, num_tries)
         i += 1
         try:
             tx, order_event, transfer_event = dt_contract.verify_order_tx(
                 tx_id, did, service_id, amount, sender
             )
             logger.debug(
-                f"validate_order succeeded for: did={did}, service_id={service_id}, tx_id={tx_id}, "
-                f"sender={sender}, num_tokens={num_tokens}, token_address={token_address}. "
-                f"result is: tx={tx}, order_event={order_event}, transfer_event={transfer_event}"
+                "validate_order succeeded for: did=%s, service_id=%s, tx_id=%s, "
+                "sender=%s, num_tokens=%s, token_address=%s. "
+                "result is: tx=%s, order_event=%s, transfer_event=%s",
+                did,
+                service_id,
+                tx_id,
+                sender,
+                num_tokens,
+                token_address,
+                tx,
+                order_event,
+                transfer_event,
             )
 
             return tx, order_event, transfer_event
@@ -245,9 +304,14 @@ def validate_transfer_not_used_for_other_service(
     did, service_id, transfer_tx_id, consumer_address, token_address
 ):
     logger.debug(
-        f"validate_transfer_not_used_for_other_service: "
-        f"did={did}, service_id={service_id}, transfer_tx_id={transfer_tx_id},"
-        f" consumer_address={consumer_address}, token_address={token_address}"
+        "validate_transfer_not_used_for_other_service: "
+        "did=%s, service_id=%s, transfer_tx_id=%s,"
+        " consumer_address=%s, token_address=%s",
+        did,
+        service_id,
+        transfer_tx_id,
+        consumer_address,
+        token_address,
     )
     return
 
@@ -256,10 +320,15 @@ def record_consume_request(
     did, service_id, order_tx_id, consumer_address, token_address, amount
 ):
     logger.debug(
-        f"record_consume_request: "
-        f"did={did}, service_id={service_id}, transfer_tx_id={order_tx_id}, "
-        f"consumer_address={consumer_address}, token_address={token_address}, "
-        f"amount={amount}"
+        "record_consume_request: "
+        "did=%s, service_id=%s, transfer_tx_id=%s, "
+        "consumer_address=%s, token_address=%s, amount=%s",
+        did,
+        service_id,
+        order_tx_id,
+        consumer_address,
+        token_address,
+        amount,
     )
     return
 
@@ -333,12 +402,10 @@ def decode_from_data(data, key, dec_type="list"):
 
 
 def service_unavailable(error, context, custom_logger=None):
-    text_items = []
-    for key, value in context.items():
-        value = value if isinstance(value, str) else json.dumps(value)
-        text_items.append(key + "=" + value)
-
-    logger_message = "Payload was: " + ",".join(text_items)
+    logger_message = "Payload was: " + ",".join(
+        f"{key}={value if isinstance(value, str) else json.dumps(value)}"
+        for key, value in context.items()
+    )
     custom_logger = custom_logger if custom_logger else logger
     custom_logger.error(logger_message, exc_info=1)
 
@@ -6,13 +6,16 @@
 import json
 import os
 
-import requests
 from ocean_lib.common.agreements.service_types import ServiceTypesIndices
+from ocean_lib.common.http_requests.requests_session import get_requests_session
 
 from ocean_provider.exceptions import RequestNotFound
 from ocean_provider.utils.accounts import sign_message
 from ocean_provider.utils.basics import get_provider_wallet
 
+# every validated request posts to the RBAC server, reuse its connections
+requests_session = get_requests_session()
+
 
 class RBACValidator:
     def __init__(
@@ -47,7 +50,7 @@ class RBACValidator:
 
     def fails(self):
         payload = self.build_payload()
-        response = requests.post(os.getenv("RBAC_SERVER_URL"), json=payload)
+        response = requests_session.post(os.getenv("RBAC_SERVER_URL"), json=payload)
         return not response.json()
 
     def get_dids(self, service_index: int):
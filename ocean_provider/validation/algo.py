@@ -2,20 +2,30 @@
 # Copyright 2021 Ocean Protocol Foundation
 # SPDX-License-Identifier: Apache-2.0
 #
+import itertools
 import json
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
 
-from eth_utils import add_0x_prefix
+from eth_utils import add_0x_prefix, event_abi_to_log_topic
+from flask import has_request_context, request
 from ocean_lib.assets.utils import create_checksum
 from ocean_lib.common.agreements.service_types import ServiceTypes
 from ocean_lib.common.did import did_to_id
 from ocean_lib.models.data_token import DataToken
-from web3.logs import DISCARD
+from ocean_lib.web3_internal.contract_utils import get_contract_definition
+from web3 import HTTPProvider
+from web3._utils.contracts import find_matching_event_abi
+from web3._utils.events import get_event_data
 
 from ocean_provider.constants import BaseURLs
 from ocean_provider.myapp import app
 from ocean_provider.serializers import StageAlgoSerializer
-from ocean_provider.utils.basics import get_asset_from_metadatastore, get_config
+from ocean_provider.utils.basics import (
+    get_asset_from_metadatastore,
+    get_config,
+)
 from ocean_provider.utils.url import append_userdata
 from ocean_provider.utils.util import (
     check_asset_consumable,
@@ -31,6 +41,9 @@ from ocean_provider.utils.util import (
 
 logger = logging.getLogger(__name__)
 
+# upper bound on input items validated concurrently within one request
+MAX_INPUT_VALIDATION_WORKERS = 8
+
 
 class WorkflowValidator:
     def __init__(self, web3, consumer_address, provider_wallet, data):
@@ -40,6 +53,8 @@ class WorkflowValidator:
         self.provider_wallet = provider_wallet
         self.data = data
         self.workflow = dict({"stages": []})
+        # values looked up while validating this request, shared by its inputs
+        self.cache = ValidationCache()
 
     def validate(self):
         """Validates for input and output contents."""
@@ -67,39 +82,78 @@ class WorkflowValidator:
 
     def validate_input(self, index=0):
         """Validates input dictionary."""
-        main_input = [
-            filter_dictionary(self.data, ["documentId", "transferTxId", "serviceId"])
-        ]
+        main_input = filter_dictionary(
+            self.data, ["documentId", "transferTxId", "serviceId"]
+        )
         additional_inputs = decode_from_data(self.data, "additionalInputs")
 
         if additional_inputs == -1:
             self.error = "Additional input is invalid or can not be decoded."
             return False
 
-        all_data = main_input + additional_inputs
+        all_data = itertools.chain([main_input], additional_inputs)
         algo_data = filter_dictionary_starts_with(self.data, "algorithm")
         if self.data.get("algouserdata"):
             algo_data["algouserdata"] = self.data["algouserdata"]
 
-        self.validated_inputs = []
+        # the validators run on worker threads, outside of the request context
+        provider_url = request.base_url if has_request_context() else None
 
+        # input items referring to the same order are validated only once,
+        # by the validator of their first occurrence
+        unique_validators = dict()
+        input_item_validators = []
         for index, input_item in enumerate(all_data):
-            input_item.update(algo_data)
-            input_item_validator = InputItemValidator(
-                self.web3,
-                self.consumer_address,
-                self.provider_wallet,
-                input_item,
-                index,
+            # merge into a copy, additionalInputs belong to the caller's payload
+            input_item = {**input_item, **algo_data}
+            key = get_input_item_key(input_item)
+            if key not in unique_validators:
+                unique_validators[key] = InputItemValidator(
+                    self.web3,
+                    self.consumer_address,
+                    self.provider_wallet,
+                    input_item,
+                    index,
+                    cache=self.cache,
+                    provider_url=provider_url,
+                )
+            input_item_validators.append(unique_validators[key])
+
+        # reject malformed items before any of them hits the network
+        for input_item_validator in unique_validators.values():
+            if not input_item_validator.validate_shape():
+                index = input_item_validator.index
+                prefix = f"Error in input at index {index}: " if index else ""
+                self.error = prefix + input_item_validator.error
+                return False
+
+        # a websocket provider holds a single connection, which the worker
+        # threads would share
+        concurrent = isinstance(self.web3.provider, HTTPProvider)
+        statuses = dict(
+            zip(
+                unique_validators.values(),
+                validate_input_items(
+                    list(unique_validators.values()), concurrent=concurrent
+                ),
             )
+        )
+        self.validated_inputs = []
+
+        for index, input_item_validator in enumerate(input_item_validators):
+            status = statuses[input_item_validator]
+            # an error raised by a later item must not hide an earlier failure
+            if isinstance(status, Exception):
+                raise status
 
-            status = input_item_validator.validate()
             if not status:
                 prefix = f"Error in input at index {index}: " if index else ""
                 self.error = prefix + input_item_validator.error
                 return False
 
-            self.validated_inputs.append(input_item_validator.validated_inputs)
+            self.validated_inputs.append(
+                dict(input_item_validator.validated_inputs, index=index)
+            )
 
             if index == 0:
                 self.service_endpoint = input_item_validator.service.service_endpoint
@@ -136,7 +190,7 @@ class WorkflowValidator:
             algorithm_token_address = algo_data.get("algorithmDataToken")
             algorithm_tx_id = algo_data.get("algorithmTransferTxId")
 
-            algo = get_asset_from_metadatastore(get_metadata_url(), algorithm_did)
+            algo = get_cached_ddo(self.cache, algorithm_did)
 
             try:
                 asset_type = algo.metadata["main"]["type"]
@@ -148,20 +202,15 @@ class WorkflowValidator:
                 return False
 
             try:
-                dt = DataToken(self.web3, self.consumer_address)
-                tx_receipt = dt.get_tx_receipt(self.web3, algorithm_tx_id)
-                event_logs = dt.events.OrderStarted().processReceipt(
-                    tx_receipt, errors=DISCARD
-                )
+                tx_receipt = DataToken.get_tx_receipt(self.web3, algorithm_tx_id)
+                event_logs = get_order_started_logs(self.web3, tx_receipt)
                 order_log = event_logs[0] if event_logs else None
                 algo_service_id = order_log.args.serviceId
                 self.algo_service = algo.get_service_by_index(algo_service_id)
 
                 if self.algo_service.type == ServiceTypes.CLOUD_COMPUTE:
-                    asset_urls = get_asset_download_urls(
-                        algo,
-                        self.provider_wallet,
-                        config_file=app.config["PROVIDER_CONFIG_FILE"],
+                    asset_urls = get_cached_download_urls(
+                        self.cache, algo, self.provider_wallet
                     )
 
                     if not asset_urls:
@@ -200,9 +249,7 @@ class WorkflowValidator:
                     self.algo_service.get_cost(),
                 )
             except Exception as e:
-                logger.debug(
-                    f"validate_order for ALGORITHM failed with error {str(e)}."
-                )
+                logger.debug("validate_order for ALGORITHM failed with error %s.", e)
                 self.error = "Algorithm is already in use or can not be found on chain."
                 return False
 
@@ -223,6 +270,167 @@ class WorkflowValidator:
         return True
 
 
+def validate_input_items(input_item_validators, concurrent=True):
+    """Runs the network bound part of the input item validators, concurrently
+    when there are several and `concurrent` is set.
+
+    Each item is validated independently and spends most of its time waiting
+    on the metadata store and the chain, so threads overlap that I/O. Items
+    are started in order and no new one is started once an item fails, so
+    like a sequential run, items after the failure are not validated. An
+    exception raised by an item counts as a failure and is returned in place
+    of its status, leaving it to the caller to raise it in input order.
+    :return: list of validation statuses, in the order of the validators,
+        with None for the items that were not validated
+    """
+    statuses = [None] * len(input_item_validators)
+    if not concurrent or len(input_item_validators) == 1:
+        for position, validator in enumerate(input_item_validators):
+            statuses[position] = validator.validate_io()
+            if not statuses[position]:
+                break
+
+        return statuses
+
+    not_started = enumerate(input_item_validators)
+    max_workers = min(MAX_INPUT_VALIDATION_WORKERS, len(input_item_validators))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running = {
+            executor.submit(validator.validate_io): position
+            for position, validator in itertools.islice(not_started, max_workers)
+        }
+        failed = False
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = running.pop(future)
+                try:
+                    statuses[position] = future.result()
+                except Exception as e:
+                    statuses[position] = e
+                    failed = True
+                else:
+                    failed = failed or not statuses[position]
+
+            if not failed:
+                for position, validator in itertools.islice(not_started, len(done)):
+                    running[executor.submit(validator.validate_io)] = position
+
+    return statuses
+
+
+def get_input_item_key(input_item):
+    """Identifies input items that validate to the same result.
+
+    Items are equal when they reference the same order and carry the same
+    userdata, which ends up in the validated urls.
+    """
+    return json.dumps(
+        [
+            input_item.get("documentId"),
+            input_item.get("serviceId"),
+            input_item.get("transferTxId"),
+            input_item.get("userdata"),
+        ],
+        sort_keys=True,
+    )
+
+
+class ValidationCache:
+    """Values looked up while validating one compute request.
+
+    Inputs of the request often share assets and algorithms, so each value is
+    fetched once and reused by the validators of the other inputs.
+    """
+
+    def __init__(self):
+        self._values = dict()
+
+    def get_or_compute(self, kind, key, fn):
+        """Returns the value of `kind` stored for `key`, calling `fn` to
+        compute it if there is none yet."""
+        try:
+            return self._values[kind, key]
+        except KeyError:
+            # setdefault keeps the first stored value if another thread raced us
+            return self._values.setdefault((kind, key), fn())
+
+
+def get_cached_ddo(cache, did):
+    """Returns the DDO for `did`, fetched at most once per `cache`."""
+    return cache.get_or_compute(
+        "ddo", did, lambda: get_asset_from_metadatastore(get_metadata_url(), did)
+    )
+
+
+def get_cached_download_urls(cache, asset, wallet):
+    """Returns the download urls of `asset`, decrypted at most once per
+    `cache` for a given provider `wallet`."""
+    return cache.get_or_compute(
+        "download_urls",
+        (asset.did, wallet.address),
+        lambda: get_asset_download_urls(
+            asset, wallet, config_file=app.config["PROVIDER_CONFIG_FILE"]
+        ),
+    )
+
+
+def get_did_to_trusted_algo_dict(trusted_algorithms):
+    """
+    :return: dict of the `trusted_algorithms` by did, or None if some of
+        them don't have a did
+    """
+    try:
+        return {algo["did"]: algo for algo in trusted_algorithms}
+    except KeyError:
+        return None
+
+
+def get_algo_checksums(algo_ddo):
+    """
+    :return: tuple of the filesChecksum and containerSectionChecksum of the
+        algorithm described by `algo_ddo`
+    """
+    service = algo_ddo.get_service(ServiceTypes.METADATA)
+    files_checksum = create_checksum(
+        service.attributes["encryptedFiles"]
+        + json.dumps(service.main["files"], separators=(",", ":"))
+    )
+    container_section_checksum = create_checksum(
+        json.dumps(service.main["algorithm"]["container"], separators=(",", ":"))
+    )
+
+    return files_checksum, container_section_checksum
+
+
+@lru_cache(maxsize=1)
+def get_order_started_event():
+    """
+    :return: tuple of the OrderStarted event ABI and its log topic, which are
+        the same for every datatoken
+    """
+    abi = get_contract_definition(DataToken.CONTRACT_NAME)["abi"]
+    event_abi = find_matching_event_abi(abi, event_name="OrderStarted")
+
+    return event_abi, event_abi_to_log_topic(event_abi)
+
+
+def get_order_started_logs(web3, tx_receipt):
+    """Decodes the OrderStarted events of `tx_receipt`.
+
+    Logs are matched on their first topic before decoding, so unrelated logs
+    (e.g. Transfer events) are skipped instead of being run through the full
+    `processReceipt` decoding and discarded.
+    """
+    event_abi, topic = get_order_started_event()
+
+    return [
+        get_event_data(web3.codec, event_abi, log)
+        for log in tx_receipt.logs
+        if log.topics and log.topics[0] == topic
+    ]
+
+
 def validate_formatted_algorithm_dict(algorithm_dict, algorithm_did):
     if algorithm_did and not (
         algorithm_dict.get("url") or algorithm_dict.get("remote")
@@ -253,15 +461,31 @@ def validate_formatted_algorithm_dict(algorithm_dict, algorithm_did):
 
 
 class InputItemValidator:
-    def __init__(self, web3, consumer_address, provider_wallet, data, index):
+    def __init__(
+        self,
+        web3,
+        consumer_address,
+        provider_wallet,
+        data,
+        index,
+        cache=None,
+        provider_url=None,
+    ):
         """Initializes the input item validator."""
         self.web3 = web3
         self.consumer_address = consumer_address
         self.provider_wallet = provider_wallet
         self.data = data
         self.index = index
+        self.cache = cache if cache is not None else ValidationCache()
+        # used for services that don't define their own endpoint
+        self.provider_url = provider_url
 
     def validate(self):
+        return self.validate_shape() and self.validate_io()
+
+    def validate_shape(self):
+        """Validates the input item keys, without any network access."""
         required_keys = ["documentId", "transferTxId"]
 
         for req_item in required_keys:
@@ -273,9 +497,13 @@ class InputItemValidator:
             self.error = "No serviceId in input item."
             return False
 
+        return True
+
+    def validate_io(self):
+        """Validates the asset, service and order of a well-formed input item."""
         self.did = self.data.get("documentId")
         try:
-            self.asset = get_asset_from_metadatastore(get_metadata_url(), self.did)
+            self.asset = get_cached_ddo(self.cache, self.did)
         except ValueError:
             self.error = f"Asset for did {self.did} not found."
             return False
@@ -283,7 +511,10 @@ class InputItemValidator:
         self.service = self.asset.get_service_by_index(self.data["serviceId"])
 
         consumable, message = check_asset_consumable(
-            self.asset, self.consumer_address, logger, self.service.service_endpoint
+            self.asset,
+            self.consumer_address,
+            logger,
+            self.service.service_endpoint or self.provider_url,
         )
 
         if not consumable:
@@ -305,10 +536,8 @@ class InputItemValidator:
             self.error = "Service for main asset must be compute."
             return False
 
-        asset_urls = get_asset_download_urls(
-            self.asset,
-            self.provider_wallet,
-            config_file=app.config["PROVIDER_CONFIG_FILE"],
+        asset_urls = get_cached_download_urls(
+            self.cache, self.asset, self.provider_wallet
         )
 
         if self.service.type == ServiceTypes.CLOUD_COMPUTE and not asset_urls:
@@ -325,19 +554,20 @@ class InputItemValidator:
                 {"index": self.index, "id": self.did, "url": asset_urls}
             )
         else:
+            remote = {
+                "txid": self.data.get("transferTxId"),
+                "serviceIndex": self.service.index,
+            }
+            userdata = self.data.get("userdata")
+            if userdata:
+                remote["userdata"] = userdata
+
             self.validated_inputs = {
                 "index": self.index,
                 "id": self.did,
-                "remote": {
-                    "txid": self.data.get("transferTxId"),
-                    "serviceIndex": self.service.index,
-                },
+                "remote": remote,
             }
 
-            userdata = self.data.get("userdata")
-            if userdata:
-                self.validate_inputs["remote"]["userdata"] = userdata
-
         return self.validate_usage()
 
     def _validate_trusted_algos(
@@ -352,46 +582,42 @@ class InputItemValidator:
             return False
 
         if trusted_publishers:
-            algo_ddo = get_asset_from_metadatastore(get_metadata_url(), algorithm_did)
+            algo_ddo = get_cached_ddo(self.cache, algorithm_did)
             if not algo_ddo.publisher in trusted_publishers:
                 self.error = "this algorithm is not from a trusted publisher"
                 return False
 
-        try:
-            did_to_trusted_algo_dict = {
-                algo["did"]: algo for algo in trusted_algorithms
-            }
-            if algorithm_did not in did_to_trusted_algo_dict:
-                self.error = f"this algorithm did {algorithm_did} is not trusted."
-                return False
+        # keyed by the compute service trusting the algorithms
+        did_to_trusted_algo_dict = self.cache.get_or_compute(
+            "trusted_algos",
+            (self.did, self.service.index),
+            lambda: get_did_to_trusted_algo_dict(trusted_algorithms),
+        )
 
-        except KeyError:
+        if did_to_trusted_algo_dict is None:
             self.error = (
                 "Some algos in the publisherTrustedAlgorithms don't have a did."
             )
             return False
 
+        if algorithm_did not in did_to_trusted_algo_dict:
+            self.error = f"this algorithm did {algorithm_did} is not trusted."
+            return False
+
         trusted_algo_dict = did_to_trusted_algo_dict[algorithm_did]
         allowed_files_checksum = trusted_algo_dict.get("filesChecksum")
         allowed_container_checksum = trusted_algo_dict.get("containerSectionChecksum")
-        algo_ddo = get_asset_from_metadatastore(
-            get_metadata_url(), trusted_algo_dict["did"]
+        algo_ddo = get_cached_ddo(self.cache, trusted_algo_dict["did"])
+        files_checksum, container_section_checksum = self.cache.get_or_compute(
+            "algo_checksums", algo_ddo.did, lambda: get_algo_checksums(algo_ddo)
         )
-        service = algo_ddo.get_service(ServiceTypes.METADATA)
 
-        files_checksum = create_checksum(
-            service.attributes["encryptedFiles"]
-            + json.dumps(service.main["files"], separators=(",", ":"))
-        )
         if allowed_files_checksum and files_checksum != allowed_files_checksum:
             self.error = (
                 f"filesChecksum for algorithm with did {algo_ddo.did} does not match"
             )
             return False
 
-        container_section_checksum = create_checksum(
-            json.dumps(service.main["algorithm"]["container"], separators=(",", ":"))
-        )
         if (
             allowed_container_checksum
             and container_section_checksum != allowed_container_checksum
@@ -460,7 +686,7 @@ class InputItemValidator:
                 self.service.get_cost(),
             )
         except Exception as e:
-            logger.debug(f"validate_usage failed with {str(e)}.")
+            logger.debug("validate_usage failed with %s.", e)
             self.error = f"Order for serviceId {self.service.index} is not valid."
             return False
 
@@ -469,8 +695,8 @@ class InputItemValidator:
 
 def build_stage_output_dict(output_def, service_endpoint, owner, provider_wallet):
     config = get_config()
-    if BaseURLs.ASSETS_URL in service_endpoint:
-        service_endpoint = service_endpoint.split(BaseURLs.ASSETS_URL)[0]
+    # default brizoUri is the provider root, i.e. the endpoint up to the assets route
+    service_endpoint = service_endpoint.partition(BaseURLs.ASSETS_URL)[0]
 
     return dict(
         {
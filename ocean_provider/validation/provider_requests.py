@@ -7,6 +7,7 @@ import os
 
 from flask import request as flask_request
 from flask_sieve import JsonRequest, ValidationException
+from flask_sieve.parser import Parser
 from flask_sieve.rules_processor import RulesProcessor
 from flask_sieve.validator import Validator
 
@@ -28,14 +29,16 @@ class CustomJsonRequest(JsonRequest):
         request = get_request_data(request)
         class_name = self.__class__.__name__
         self._validators = list()
-        action_mapping = RBACValidator.get_action_mapping()
-        if os.getenv("RBAC_SERVER_URL") and class_name in action_mapping.keys():
+        if (
+            os.getenv("RBAC_SERVER_URL")
+            and class_name in RBACValidator.get_action_mapping()
+        ):
             self._validators.append(
                 RBACValidator(request_name=class_name, request=request)
             )
         self._validators.append(
             CustomValidator(
-                rules=self.rules(),
+                parsed_rules=self.parsed_rules(),
                 messages={
                     "signature.signature": "Invalid signature provided.",
                     "signature.download_signature": "Invalid signature provided.",
@@ -44,6 +47,19 @@ class CustomJsonRequest(JsonRequest):
             )
         )
 
+    def parsed_rules(self):
+        """
+        Rules are static per request class, so they are parsed once and kept
+        on the class instead of being re-parsed on every request.
+        """
+        cls = type(self)
+        parsed_rules = cls.__dict__.get("_parsed_rules")
+        if parsed_rules is None:
+            parsed_rules = Parser(self.rules()).parsed_rules()
+            cls._parsed_rules = parsed_rules
+
+        return parsed_rules
+
     def validate(self):
         for validator in self._validators:
             if validator.fails():
@@ -60,12 +76,27 @@ class CustomValidator(Validator):
     """
 
     def __init__(
-        self, rules=None, request=None, custom_handlers=None, messages=None, **kwargs
+        self,
+        rules=None,
+        request=None,
+        custom_handlers=None,
+        messages=None,
+        parsed_rules=None,
+        **kwargs,
     ):
         super(CustomValidator, self).__init__(
             rules, request, custom_handlers, messages, **kwargs
         )
         self._processor = CustomRulesProcessor()
+        self._parsed_rules = parsed_rules
+
+    def passes(self):
+        if self._parsed_rules is None:
+            return super(CustomValidator, self).passes()
+
+        self._processor.set_rules(self._parsed_rules)
+        self._processor.set_request(self._request)
+        return self._processor.passes()
 
 
 class CustomRulesProcessor(RulesProcessor):
@@ -76,6 +107,12 @@ class CustomRulesProcessor(RulesProcessor):
     attributes
     """
 
+    def _resolve_params(self, params, size, rule):
+        """Returns the values of the first `size` request fields named in
+        `params`, which must name at least that many."""
+        self._assert_params_size(size=size, params=params, rule=rule)
+        return tuple(self._attribute_value(param) for param in params[:size])
+
     def validate_signature(self, value, params, **kwargs):
         """
         Validates a signature using the documentId, jobId and consumerAddress.
@@ -89,10 +126,9 @@ class CustomRulesProcessor(RulesProcessor):
             description: The list of parameters defined for the rule,
                          i.e. names of other fields inside the request.
         """
-        self._assert_params_size(size=3, params=params, rule="signature")
-        owner = self._attribute_value(params[0]) or ""
-        did = self._attribute_value(params[1]) or ""
-        job_id = self._attribute_value(params[2]) or ""
+        owner, did, job_id = (
+            param or "" for param in self._resolve_params(params, 3, "signature")
+        )
 
         original_msg = f"{owner}{job_id}{did}"
         try:
@@ -116,9 +152,7 @@ class CustomRulesProcessor(RulesProcessor):
             description: The list of parameters defined for the rule,
                          i.e. names of other fields inside the request.
         """
-        self._assert_params_size(size=2, params=params, rule="signature")
-        owner = self._attribute_value(params[0])
-        did = self._attribute_value(params[1])
+        owner, did = self._resolve_params(params, 2, "signature")
         original_msg = f"{did}"
         try:
             verify_signature(owner, value, original_msg, get_nonce(owner))
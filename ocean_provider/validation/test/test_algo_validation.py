@@ -3,15 +3,36 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 import json
+import threading
+from types import SimpleNamespace
 
 from ocean_lib.common.agreements.service_types import ServiceTypes
-
-from ocean_provider.validation.algo import WorkflowValidator, build_stage_output_dict
+from ocean_lib.models.data_token import DataToken
+from web3 import HTTPProvider
+
+from ocean_provider.validation import algo
+from ocean_provider.validation.algo import (
+    MAX_INPUT_VALIDATION_WORKERS,
+    WorkflowValidator,
+    build_stage_output_dict,
+    validate_input_items,
+)
 from tests.helpers.compute_helpers import build_and_send_ddo_with_compute_service
+from tests.test_helpers import (
+    get_dataset_ddo_with_access_service,
+    mint_tokens_and_wait,
+    send_order,
+)
 
 
 def test_passes(
-    client, provider_wallet, consumer_wallet, consumer_address, publisher_wallet, web3
+    monkeypatch,
+    client,
+    provider_wallet,
+    consumer_wallet,
+    consumer_address,
+    publisher_wallet,
+    web3,
 ):
     """Tests happy flow of validator with algo ddo and raw algo."""
     ddo, tx_id, alg_ddo, alg_tx_id = build_and_send_ddo_with_compute_service(
@@ -34,6 +55,25 @@ def test_passes(
     validator = WorkflowValidator(web3, consumer_address, provider_wallet, data)
     assert validator.validate() is True
 
+    # an input repeated in additionalInputs is validated once, listed twice
+    validated_items = []
+    validate_io = algo.InputItemValidator.validate_io
+
+    def counting_validate_io(input_item_validator):
+        validated_items.append(input_item_validator.index)
+        return validate_io(input_item_validator)
+
+    monkeypatch.setattr(algo.InputItemValidator, "validate_io", counting_validate_io)
+    data["additionalInputs"] = [
+        {"documentId": ddo.did, "transferTxId": tx_id, "serviceId": sa.index}
+    ]
+    validator = WorkflowValidator(web3, consumer_address, provider_wallet, data)
+    assert validator.validate() is True
+    assert validated_items == [0]
+    validated_inputs = validator.workflow["stages"][0]["input"]
+    assert [item["index"] for item in validated_inputs] == [0, 1]
+    assert validated_inputs[0]["url"] == validated_inputs[1]["url"]
+
     data = {
         "documentId": ddo.did,
         "serviceId": sa.index,
@@ -54,6 +94,69 @@ def test_passes(
     assert validator.validate() is True
 
 
+def test_remote_input_with_userdata(
+    monkeypatch,
+    client,
+    provider_wallet,
+    consumer_wallet,
+    consumer_address,
+    publisher_wallet,
+    web3,
+):
+    """Tests that userdata is kept for inputs served by another provider."""
+    ddo, tx_id, alg_ddo, alg_tx_id = build_and_send_ddo_with_compute_service(
+        client, publisher_wallet, consumer_wallet
+    )
+    sa = ddo.get_service(ServiceTypes.CLOUD_COMPUTE)
+
+    remote_ddo = get_dataset_ddo_with_access_service(client, publisher_wallet)
+    remote_dt = DataToken(web3, remote_ddo.data_token_address)
+    mint_tokens_and_wait(remote_dt, consumer_wallet, publisher_wallet)
+    remote_sa = remote_ddo.get_service(ServiceTypes.ASSET_ACCESS)
+    remote_tx_id = send_order(client, remote_ddo, remote_dt, remote_sa, consumer_wallet)
+
+    # the remote asset files can not be decrypted by this provider
+    get_cached_download_urls = algo.get_cached_download_urls
+
+    def get_local_download_urls(cache, asset, wallet):
+        if asset.did == remote_ddo.did:
+            return []
+        return get_cached_download_urls(cache, asset, wallet)
+
+    monkeypatch.setattr(algo, "get_cached_download_urls", get_local_download_urls)
+
+    userdata = {"surname": "XXX", "age": 12}
+    data = {
+        "documentId": ddo.did,
+        "serviceId": sa.index,
+        "transferTxId": tx_id,
+        "output": build_stage_output_dict(
+            dict(), sa.service_endpoint, consumer_address, publisher_wallet
+        ),
+        "algorithmDid": alg_ddo.did,
+        "algorithmDataToken": alg_ddo.data_token_address,
+        "algorithmTransferTxId": alg_tx_id,
+        "additionalInputs": [
+            {
+                "documentId": remote_ddo.did,
+                "transferTxId": remote_tx_id,
+                "serviceId": remote_sa.index,
+                "userdata": userdata,
+            }
+        ],
+    }
+
+    validator = WorkflowValidator(web3, consumer_address, provider_wallet, data)
+    assert validator.validate() is True
+    remote_input = validator.validated_inputs[1]
+    assert remote_input["id"] == remote_ddo.did
+    assert remote_input["remote"] == {
+        "txid": remote_tx_id,
+        "serviceIndex": remote_sa.index,
+        "userdata": userdata,
+    }
+
+
 def test_fails(
     client, provider_wallet, consumer_wallet, consumer_address, publisher_wallet, web3
 ):
@@ -231,6 +334,12 @@ def test_fails(
         == "Error in input at index 1: Asset for did i am not a did not found."
     )
 
+    # malformed inputs are reported before any asset is looked up
+    data["additionalInputs"].append({"documentId": did, "transferTxId": tx_id})
+    validator = WorkflowValidator(web3, consumer_address, provider_wallet, data)
+    assert validator.validate() is False
+    assert validator.error == "Error in input at index 2: No serviceId in input item."
+
     # Service is not compute, nor access
     other_service = [
         s
@@ -317,3 +426,86 @@ def test_fails(
         validator.error
         == f"Error in input at index 1: this algorithm did {alg_ddo.did} is not trusted."
     )
+
+
+def test_validate_input_items_stops_after_failure():
+    """Tests that no input is started once an earlier one failed."""
+
+    class DummyValidator:
+        def __init__(self, status):
+            self.status = status
+            self.validated = False
+
+        def validate_io(self):
+            self.validated = True
+            return self.status
+
+    validators = [DummyValidator(False)] + [
+        DummyValidator(True) for _ in range(3 * MAX_INPUT_VALIDATION_WORKERS)
+    ]
+    statuses = validate_input_items(validators)
+
+    assert statuses[0] is False
+    assert None in statuses
+    assert all(
+        status is None for status, v in zip(statuses, validators) if not v.validated
+    )
+
+
+def test_failure_is_reported_before_a_later_exception(monkeypatch):
+    """Tests that an item raising does not hide the failure of an earlier one."""
+    later_item_raised = threading.Event()
+
+    def validate_io(self):
+        if self.index == 0:
+            self.service = SimpleNamespace(service_endpoint="http://provider")
+            self.validated_inputs = {"index": 0}
+            return True
+
+        if self.index == 1:
+            # fail only after the later item raised
+            later_item_raised.wait(timeout=5)
+            self.error = "Order for serviceId 0 is not valid."
+            return False
+
+        later_item_raised.set()
+        raise ConnectionError("metadata store is unreachable")
+
+    monkeypatch.setattr(algo.InputItemValidator, "validate_io", validate_io)
+
+    data = {
+        "documentId": "did:op:main",
+        "serviceId": 0,
+        "transferTxId": "0xmain",
+        "additionalInputs": [
+            {"documentId": "did:op:first", "serviceId": 0, "transferTxId": "0x1"},
+            {"documentId": "did:op:second", "serviceId": 0, "transferTxId": "0x2"},
+        ],
+    }
+    web3 = SimpleNamespace(provider=HTTPProvider("http://127.0.0.1:8545"))
+    validator = WorkflowValidator(web3, "0xconsumer", None, data)
+
+    assert validator.validate_input() is False
+    assert (
+        validator.error
+        == "Error in input at index 1: Order for serviceId 0 is not valid."
+    )
+
+
+def test_validate_input_items_sequentially():
+    """Tests that inputs are validated in order, up to the first failure."""
+
+    class DummyValidator:
+        def __init__(self, status):
+            self.status = status
+            self.validated = False
+
+        def validate_io(self):
+            self.validated = True
+            return self.status
+
+    validators = [DummyValidator(True), DummyValidator(False), DummyValidator(True)]
+    statuses = validate_input_items(validators, concurrent=False)
+
+    assert statuses == [True, False, None]
+    assert [v.validated for v in validators] == [True, True, False]
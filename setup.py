@@ -41,6 +41,7 @@ install_requirements = [
     "flask-sieve==1.2.2",
     "SQLAlchemy==1.3.23",
     "json-sempai==0.4.0",
+    "cachetools==4.2.2",
 ]
 
 # Required to run setup.py: